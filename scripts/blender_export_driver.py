@@ -1,48 +1,80 @@
 # blender_export_driver.py
-import os, json, hashlib, subprocess
+import os, sys, json, hashlib, queue, subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 BLENDER = "C:/Program Files/Blender Foundation/Blender 4.5/blender.exe"
 
 ROOT = Path(".").resolve()
 GLB_EXPORTER   = ROOT / "scripts" / "blender_export_glb.py"
 LEVEL_EXPORTER = ROOT / "scripts" / "blender_export_level.py"
+EXPORT_SERVER  = ROOT / "scripts" / "blender_export_server.py"
 LEVELS_DIR     = ROOT / "assets" / "recola" / "levels"
 PROPS_DIR      = ROOT / "assets" / "recola" / "props"
 OUT            = ROOT / "tmp" / "export" / "recola"
 CACHE_FILE     = OUT / ".export_cache.json"
+EXPORT_WORKERS = max(2, (os.cpu_count() or 1) // 2)
 
 OUT.mkdir(parents=True, exist_ok=True)
 
-def sha256_file(p: Path) -> str:
-    h = hashlib.sha256()
+# Prefix for cache entries; bump whenever the hashing scheme changes so stale
+# entries never compare equal.
+HASH_VERSION   = "blake2b-v2"
+
+def _blake2b():
+    return hashlib.blake2b(digest_size=32)
+
+def file_hash(p: Path) -> bytes:
     with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return hashlib.file_digest(f, _blake2b).digest()
+
+def export_inputs(blend: Path, exporter: Path) -> tuple[Path, ...]:
+    # Everything which influences an export: the blend file, the exporter script
+    # and the server script driving it inside Blender.
+    return (blend, exporter, EXPORT_SERVER)
 
 def combined_hash(blend: Path, exporter: Path) -> str:
     # Hash the blend bytes + exporter script bytes. If either changes, we rebuild.
-    h = hashlib.sha256()
-    for p in (blend, exporter):
+    # This is only a content fingerprint, so a fast non-SHA hash is plenty.
+    h = _blake2b()
+    for p in export_inputs(blend, exporter):
         h.update(p.name.encode("utf-8"))
-        with p.open("rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
-    return h.hexdigest()
+        h.update(file_hash(p))
+    return f"{HASH_VERSION}:{h.hexdigest()}"
 
 def load_cache() -> dict:
     if CACHE_FILE.is_file():
         try:
-            return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+            data = CACHE_FILE.read_bytes()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
         except Exception:
             return {}
     return {}
 
 def save_cache(cache: dict) -> None:
-    CACHE_FILE.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding="utf-8")
+    # The cache is not meant to be read by humans, so skip pretty-printing.
+    if orjson is not None:
+        data = orjson.dumps(cache, option=orjson.OPT_SORT_KEYS)
+    else:
+        data = json.dumps(cache, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    # Write to a temp file first so a crash never leaves a truncated cache behind.
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, CACHE_FILE)
 
-def should_export(blend: Path, kind: str, cache: dict) -> tuple[bool, str, Path]:
+def stat_key(blend: Path, exporter: Path) -> list[int]:
+    key = []
+    for p in export_inputs(blend, exporter):
+        st = p.stat()
+        key += [st.st_mtime_ns, st.st_size]
+    return key
+
+def should_export(blend: Path, kind: str, cache: dict) -> tuple[bool, dict, Path]:
     stem = blend.stem
     if kind == "asset":
         exporter = GLB_EXPORTER
@@ -51,61 +83,176 @@ def should_export(blend: Path, kind: str, cache: dict) -> tuple[bool, str, Path]
         exporter = LEVEL_EXPORTER
         out_file = OUT / "levels" / f"{stem}.json"
 
-    new_hash = combined_hash(blend, exporter)
     key = str(blend.resolve())
+    prev = cache.get(key)
+    if not isinstance(prev, dict):
+        prev = {}
+
+    # Only hash the file contents if mtime or size changed since the last run.
+    entry = {"stat": stat_key(blend, exporter), "hash": prev.get("hash")}
+    if entry["stat"] != prev.get("stat"):
+        entry["hash"] = combined_hash(blend, exporter)
 
     # Export if hash changed or output is missing.
-    prev = cache.get(key)
-    if prev != new_hash or not out_file.is_file():
-        return True, new_hash, out_file
-    return False, new_hash, out_file
-
-def run_asset(blend: Path, out: Path):
-    subprocess.run(
-        [
-            BLENDER, "--background", "--factory-startup",
-            str(blend),
-            "--python", str(GLB_EXPORTER),
-            "--", "--out", str(out),
-        ],
-        check=True,
-    )
-
-def run_level(blend: Path, out: Path):
-    subprocess.run(
-        [
-            BLENDER, "--background", "--factory-startup",
-            str(blend),
-            "--python", str(LEVEL_EXPORTER),
-            "--", "--out", str(out),
-        ],
-        check=True,
-    )
-
-def process_dir(dir_path: Path, kind: str, cache: dict) -> None:
+    if entry["hash"] != prev.get("hash") or not out_file.is_file():
+        return True, entry, out_file
+    if entry["stat"] != prev.get("stat"):
+        # Touched but unchanged: remember the new stat so the next run is fast.
+        cache[key] = entry
+    return False, entry, out_file
+
+class ExportServer:
+    # A Blender process running blender_export_server.py. Requests are JSON lines
+    # on its stdin; responses are the stdout lines starting with
+    # RESPONSE_PREFIX. Anything else on stdout is Blender's own output.
+    RESPONSE_PREFIX = "@@EXPORT@@ "
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [
+                BLENDER, "--background", "--factory-startup",
+                "--python", str(EXPORT_SERVER),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+
+    def send(self, req: dict):
+        self.proc.stdin.write(json.dumps(req) + "\n")
+        self.proc.stdin.flush()
+
+    def receive(self) -> dict:
+        for line in self.proc.stdout:
+            if line.startswith(self.RESPONSE_PREFIX):
+                return json.loads(line[len(self.RESPONSE_PREFIX):])
+            print(line, end="")
+        raise RuntimeError(f"Blender export server exited with code {self.proc.wait()}")
+
+    def close(self):
+        # Closing stdin ends the server loop and Blender quits.
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=30)
+        except Exception:
+            self.kill()
+
+    def kill(self):
+        self.proc.kill()
+        self.proc.wait()
+
+class ExportServerPool:
+    # Keeps a few Blender processes alive so startup is paid once per worker
+    # instead of once per exported file. Servers are started on first use, and a
+    # server which failed (crashed, broken pipe, ...) is dropped and replaced by a
+    # fresh one for the next request.
+    def __init__(self, size: int):
+        self.slots = queue.Queue()
+        for _ in range(size):
+            self.slots.put(None)
+
+    def export(self, op: str, blend: Path, out: Path) -> dict:
+        req = {"op": op, "blend": str(blend), "out": str(out)}
+        server = self.slots.get()
+        try:
+            if server is not None:
+                try:
+                    server.send(req)
+                except OSError:
+                    # The server died after its previous answer and never saw
+                    # this request; retry it once on a fresh one.
+                    server.kill()
+                    server = None
+            if server is None:
+                server = ExportServer()
+                server.send(req)
+            return server.receive()
+        except Exception:
+            if server is not None:
+                server.kill()
+                server = None
+            raise
+        finally:
+            self.slots.put(server)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        while not self.slots.empty():
+            server = self.slots.get_nowait()
+            if server is not None:
+                server.close()
+
+def find_blends(root: Path) -> list[Path]:
+    # os.walk is scandir based and much faster than Path.rglob on large trees.
+    # Match case-insensitively like rglob does on Windows.
+    hits = []
+    for base, _, files in os.walk(root):
+        b = Path(base)
+        hits.extend(b / f for f in files if f.lower().endswith(".blend"))
+    return sorted(hits)
+
+def collect_pending(dir_path: Path, kind: str, cache: dict) -> list[tuple]:
     if not dir_path.is_dir():
-        return
-    for b in sorted(dir_path.rglob("*.blend")):
-        do_export, h, out_file = should_export(b, kind, cache)
+        return []
+    if kind == "asset":
+        op, out_dir = "export_asset", OUT / "props"
+    else:
+        op, out_dir = "export_level", OUT / "levels"
+
+    pending = []
+    for b in find_blends(dir_path):
+        do_export, entry, out_file = should_export(b, kind, cache)
         header = f"===== {kind.upper()}: {b}"
         if do_export:
             print(header + "  -> exporting")
-            if kind == "asset":
-                run_asset(b, OUT / "props")
-            else:
-                run_level(b, OUT / "levels")
-            if out_file.is_file():
-                cache[str(b.resolve())] = h
-            else:
-                print(f"WARNING: expected output not found: {out_file}")
+            pending.append((op, b, out_dir, entry, out_file))
         else:
             print(header + "  -> up-to-date")
+    return pending
+
+def run_exports(pending: list[tuple], cache: dict) -> int:
+    # Returns the number of files which failed to export.
+    if not pending:
+        return 0
+    failures = 0
+    # Each Blender instance holds a full scene in memory, so cap the fan-out.
+    workers = min(EXPORT_WORKERS, len(pending))
+    with ExportServerPool(workers) as pool, ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {
+            ex.submit(pool.export, op, b, out_dir): (b, entry, out_file)
+            for op, b, out_dir, entry, out_file in pending
+        }
+        for fut in as_completed(futures):
+            b, entry, out_file = futures[fut]
+            try:
+                resp = fut.result()
+            except Exception as e:
+                resp = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            if not resp["ok"]:
+                print(f"WARNING: export failed for {b}: {resp['error']}")
+                failures += 1
+            elif out_file.is_file():
+                cache[str(b.resolve())] = entry
+            else:
+                print(f"WARNING: expected output not found: {out_file}")
+                failures += 1
+    return failures
 
 def main():
     cache = load_cache()
-    process_dir(PROPS_DIR,  "asset", cache)
-    process_dir(LEVELS_DIR, "level", cache)
-    save_cache(cache)
+    pending = collect_pending(PROPS_DIR, "asset", cache)
+    pending += collect_pending(LEVELS_DIR, "level", cache)
+    try:
+        failures = run_exports(pending, cache)
+    finally:
+        # Keep the results of the exports which did succeed.
+        save_cache(cache)
+    if failures:
+        print(f"ERROR: {failures} export(s) failed")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
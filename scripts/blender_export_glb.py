@@ -35,16 +35,7 @@ def export_asset_glb(output_path: Path):
     )
     print(f"   Exported to {output_path}")
 
-def parse_args(argv):
-    p = argparse.ArgumentParser()
-    p.add_argument("--out", required=True)
-    return p.parse_args(argv)
-
-def main(argv):
-    # Blender passes its own args; split after '--'
-    args = parse_args(argv)
-    out_dir = Path(args.out)
-
+def export_loaded_blend(out_dir: Path):
     # Ensure the .blend file is actually loaded (it is when invoked as `blender file.blend --python ...`)
     if not bpy.data.filepath:
         raise RuntimeError("No .blend loaded; call Blender with a file path before --python.")
@@ -55,6 +46,16 @@ def main(argv):
 
     export_asset_glb(output_path)
 
+def parse_args(argv):
+    p = argparse.ArgumentParser()
+    p.add_argument("--out", required=True)
+    return p.parse_args(argv)
+
+def main(argv):
+    # Blender passes its own args; split after '--'
+    args = parse_args(argv)
+    export_loaded_blend(Path(args.out))
+
 if __name__ == "__main__":
     argv = sys.argv[(sys.argv.index("--") + 1):] if "--" in sys.argv else []
     main(argv)
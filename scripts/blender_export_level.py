@@ -1,28 +1,35 @@
 import argparse
 import bpy
 import json
-import mathutils
 import os
+import re
 import sys
 from pathlib import Path
 
+try:
+    # Much faster encoder; not bundled with Blender, so fall back to stdlib json.
+    import orjson
+except ImportError:
+    orjson = None
+
 # ---------- helpers ----------
 
-def world_xform(obj):
-    depsgraph = bpy.context.evaluated_depsgraph_get()
+def world_xform(obj, depsgraph):
     eval_obj = obj.evaluated_get(depsgraph)
     loc, rot, scl = eval_obj.matrix_world.decompose()
-    rot = rot.normalized()
+    rot.normalize()
+    # mathutils vectors iterate as plain Python floats.
     return (
-        [float(loc.x), float(loc.y), float(loc.z)],
-        [float(rot.x), float(rot.y), float(rot.z), float(rot.w)],  # quat
-        [float(scl.x), float(scl.y), float(scl.z)],
+        list(loc),
+        [rot.x, rot.y, rot.z, rot.w],  # quat
+        list(scl),
     )
 
+# Blender's duplicate suffix: .001 to .999
+_DUPSUFFIX_RE = re.compile(r"\.(?!000)[0-9]{3}\Z")
+
 def clean_name(name: str) -> str:
-    if name.endswith(tuple(f".{i:03d}" for i in range(1, 1000))):
-        return name.rsplit(".", 1)[0]
-    return name
+    return name.rsplit(".", 1)[0] if _DUPSUFFIX_RE.search(name) else name
 
 def asset_id_for_object(obj) -> str:
     if "asset_id" in obj:
@@ -54,18 +61,23 @@ def is_visible_in_view_layer(obj, view_layer) -> bool:
 
 # --- custom properties serialization ---
 
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
 def _json_sanitize(v):
     # Convert Blender/IDProperty types into plain JSON types.
-    if isinstance(v, (str, int, bool, float)) or v is None:
+    # Scalars are by far the most common, so test for them first. mathutils types
+    # are dispatched by name which is cheaper than isinstance on those classes.
+    if isinstance(v, _JSON_SCALARS):
         return v
     if isinstance(v, (list, tuple)):
         return [_json_sanitize(x) for x in v]
-    if isinstance(v, (mathutils.Vector, mathutils.Euler)):
+    t = type(v).__name__
+    if t == "Vector" or t == "Euler":
         return [float(x) for x in v]
-    if isinstance(v, mathutils.Quaternion):
+    if t == "Quaternion":
         q = v.normalized()
         return [float(q.x), float(q.y), float(q.z), float(q.w)]
-    if isinstance(v, mathutils.Color):
+    if t == "Color":
         return [float(v.r), float(v.g), float(v.b)]
     # IDPropertyArray and similar sequence-like values
     try:
@@ -74,6 +86,9 @@ def _json_sanitize(v):
         return str(v)
 
 def collect_custom_props(id_block) -> dict:
+    # Most objects have no custom properties at all.
+    if not id_block.keys():
+        return {}
     # id_block.items() yields only user-defined properties; filter out UI meta.
     return {k: _json_sanitize(v) for k, v in id_block.items() if k != "_RNA_UI"}
 
@@ -88,14 +103,15 @@ def blend_name() -> str:
 def collect_all_instances():
     instances = []
     vl = bpy.context.view_layer
+    depsgraph = bpy.context.evaluated_depsgraph_get()
 
-    for obj in vl.objects:
+    for obj in list(vl.objects):
     #    if not is_exportable_instance(obj):
     #        continue
         if obj.hide_get():   # skip if invisible via eye icon
             continue
 
-        location, rotation, scale = world_xform(obj)
+        location, rotation, scale = world_xform(obj, depsgraph)
 
         entry = {
             "name": obj.name,
@@ -128,8 +144,12 @@ def export(out_dir):
 
     instances = collect_all_instances()
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump({"instances": instances}, f, indent=2)
+    data = {"instances": instances}
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
 
     print(f"  Exported {len(instances)} instances to {output_path}")
 
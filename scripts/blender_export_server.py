@@ -0,0 +1,54 @@
+# blender_export_server.py (runs inside Blender)
+#
+# Long-lived export worker. Reads one JSON request per line from stdin, e.g.
+#   {"op": "export_asset", "blend": "...", "out": "..."}
+# and answers each with one line on stdout: RESPONSE_PREFIX followed by JSON,
+# {"ok": true} or {"ok": false, "error": "..."}. Other stdout lines (e.g. the
+# Blender banner printed before this script runs) carry no prefix. Exits when
+# stdin is closed.
+import bpy, json, os, sys, traceback
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import blender_export_glb
+import blender_export_level
+
+def export_asset(blend: str, out_dir: Path):
+    bpy.ops.wm.open_mainfile(filepath=blend)
+    blender_export_glb.export_loaded_blend(out_dir)
+
+def export_level(blend: str, out_dir: Path):
+    bpy.ops.wm.open_mainfile(filepath=blend)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    blender_export_level.export(out_dir)
+
+RESPONSE_PREFIX = "@@EXPORT@@ "
+
+OPS = {
+    "export_asset": export_asset,
+    "export_level": export_level,
+}
+
+def main():
+    # Keep stdout for responses only; Blender and the exporters log a lot, so
+    # redirect everything else (including C-level output) to stderr.
+    sys.stdout.flush()
+    responses = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            req = json.loads(line)
+            OPS[req["op"]](req["blend"], Path(req["out"]))
+            resp = {"ok": True}
+        except Exception as e:
+            traceback.print_exc()
+            resp = {"ok": False, "error": str(e)}
+        sys.stdout.flush()
+        responses.write(RESPONSE_PREFIX + json.dumps(resp) + "\n")
+        responses.flush()
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,123 @@ import shutil
 import subprocess
 from pathlib import Path
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+COPY_WORKERS = min(16, (os.cpu_count() or 1) * 4)
+
+
+def _copy_if_changed(src: Path, dst_dir: Path) -> Path:
+    # Staged files are only read by the asset packer, so a hardlink is enough.
+    # Fall back to a plain copy e.g. when crossing drives. Files which are
+    # already staged and unchanged (same size, not older) are left alone.
+    dst = dst_dir / src.name
+    ss = src.stat()
+    try:
+        ds = dst.stat()
+        if ds.st_size == ss.st_size and ds.st_mtime_ns >= ss.st_mtime_ns:
+            return dst
+        dst.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+        os.utime(dst, ns=(ss.st_atime_ns, ss.st_mtime_ns))
+    return dst
+
+
+def _prune(root: Path, keep: set[Path]):
+    # Remove staged files which no longer have a source.
+    for base, _, files in os.walk(root):
+        for f in files:
+            path = Path(base) / f
+            if path not in keep:
+                path.unlink()
+
+
+def _scan(src_dir: Path, dst_dir: Path, exts: set[str]) -> list[tuple[Path, Path]]:
+    # Single directory pass; scandir entries carry their file type, so unlike
+    # glob there is no extra stat per candidate. Extensions are matched
+    # case-insensitively like glob does on Windows.
+    if not src_dir.is_dir():
+        return []
+    with os.scandir(src_dir) as it:
+        return [
+            (Path(entry.path), dst_dir)
+            for entry in it
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in exts
+        ]
+
+
+def _asset_sources(repo_root: Path) -> list[tuple[Path, str, set[str]]]:
+    # (source directory, location inside the asset pack, extensions to pack)
+    candy_dir = Path("I:/Ikabur/atuin/crates/candy")
+
+    # 3.a recola assets
+    sources = [
+        (
+            repo_root / "tmp" / "export" / "recola" / sub,
+            f"assets/recola/{sub}",
+            {".glb", ".json"},
+        )
+        for sub in ["props", "levels"]
+    ]
+
+    # 3. audio
+    sources += [
+        (
+            repo_root / "assets" / "recola" / "audio" / sub,
+            f"assets/recola/audio/{sub}",
+            {".wav"},
+        )
+        for sub in ["effects", "music"]
+    ]
+
+    # 3.b candy assets
+    sources.append(
+        (candy_dir / "candy_glassworks" / "shaders", "assets/shaders", {".wgsl"})
+    )
+    sources += [
+        (
+            candy_dir / "candy_render_nodes" / "src" / folder,
+            f"assets/candy/{folder}",
+            {".wgsl"},
+        )
+        for folder in [
+            "bloom",
+            "cocktail",
+            "fxaa",
+            "screen_space_quad",
+            "sky",
+            "tonemap",
+        ]
+    ]
+
+    return sources
+
+
+def _stage_assets(repo_root: Path, tmp_dir_assets: Path):
+    pairs = []
+    for src_dir, prefix, exts in _asset_sources(repo_root):
+        tmp_asset_dir = tmp_dir_assets / prefix
+        tmp_asset_dir.mkdir(parents=True, exist_ok=True)
+        pairs += _scan(src_dir, tmp_asset_dir, exts)
+
+    # 3.a Copy props.json
+    pairs.append(
+        (
+            repo_root / "assets" / "recola" / "props.json",
+            tmp_dir_assets / "assets" / "recola",
+        )
+    )
+
+    # Copying is I/O bound, so overlap the per-file syscalls on a thread pool.
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+        staged = set(ex.map(lambda p: _copy_if_changed(*p), pairs))
+
+    # Stale files must not end up in the pack.
+    _prune(tmp_dir_assets, staged)
 
 
 def package_assets():
@@ -14,48 +131,7 @@ def package_assets():
 
     tmp_dir_assets = repo_root / "tmp" / "recola" / "release-assets"
     tmp_dir_assets.mkdir(parents=True, exist_ok=True)
-
-    # 3.a Copy recola assets
-    for sub in ["props", "levels"]:
-        assets_dir = repo_root / "tmp" / "export" / "recola" / sub
-        tmp_asset_dir = tmp_dir_assets / "assets" / "recola" / sub
-        tmp_asset_dir.mkdir(parents=True, exist_ok=True)
-        for ext in ("*.glb", "*.json"):
-            for src in assets_dir.glob(ext):
-                shutil.copy2(src, tmp_asset_dir / src.name)
-
-    # 3.a Copy props.json
-    shutil.copy2(
-        repo_root / "assets" / "recola" / "props.json",
-        tmp_dir_assets / "assets" / "recola" / "props.json",
-    )
-
-    # 3. audio
-    for sub in ["effects", "music"]:
-        assets_dir = repo_root / "assets" / "recola" / "audio" / sub
-        tmp_asset_dir = tmp_dir_assets / "assets" / "recola" / "audio" / sub
-        tmp_asset_dir.mkdir(parents=True, exist_ok=True)
-        for ext in ("*.wav",):
-            for src in assets_dir.glob(ext):
-                shutil.copy2(src, tmp_asset_dir / src.name)
-
-    # 3.b Copy candy assets
-    assets_dir = Path("I:/Ikabur/atuin/crates/candy/candy_glassworks/shaders")
-    tmp_asset_dir = tmp_dir_assets / "assets" / "shaders"
-    tmp_asset_dir.mkdir(parents=True, exist_ok=True)
-    for ext in ("*.wgsl",):
-        for src in assets_dir.glob(ext):
-            shutil.copy2(src, tmp_asset_dir / src.name)
-
-    for folder in ["bloom", "cocktail", "fxaa", "screen_space_quad", "sky", "tonemap"]:
-        assets_dir = (
-            Path("I:/Ikabur/atuin/crates/candy/candy_render_nodes/src") / folder
-        )
-        tmp_asset_dir = tmp_dir_assets / "assets" / "candy" / folder
-        tmp_asset_dir.mkdir(parents=True, exist_ok=True)
-        for ext in ("*.wgsl",):
-            for src in assets_dir.glob(ext):
-                shutil.copy2(src, tmp_asset_dir / src.name)
+    _stage_assets(repo_root, tmp_dir_assets)
 
     # Pack assets
     subprocess.run(
@@ -117,9 +193,18 @@ def create_release():
     bin_dst = tmp_dir / bin_src.name
     shutil.copy2(bin_src, bin_dst)
 
+    # The payload is dominated by the already compressed asset database, so use
+    # the fastest compression level and let 7-Zip use all cores.
     zip_path = "../recola-release.7z"
     subprocess.run(
-        ["C:/Program Files/7-Zip/7z.exe", "a", str(zip_path), "."],
+        [
+            "C:/Program Files/7-Zip/7z.exe",
+            "a",
+            "-mmt=on",
+            "-mx=1",
+            str(zip_path),
+            ".",
+        ],
         cwd=tmp_dir,
         check=True,
     )